@@ -8,6 +8,7 @@ SECRET_KEY = 'prod-secret-key-change-in-production'  # Change this in production
 DEBUG = False  # Set to False for production
 HOST = '0.0.0.0'  # Allow external connections for server
 PORT = 7070
+SQLITE_SYNCHRONOUS = 'NORMAL'  # SQLite commit durability under WAL: NORMAL survives app crashes; FULL also fsyncs every commit for power-loss safety
 
 # Instructions:
 # 1. The application uses individual SQLite databases for each application (CVAR ALL, CVAR NYQ, XVA, REG, OTHERS)
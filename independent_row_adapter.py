@@ -4,13 +4,96 @@ Each application uses its own SQLite DB; rows are independent (no parent-child r
 """
 
 import os
+import queue
 import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+from config import SQLITE_SYNCHRONOUS
+
 logger = logging.getLogger("prodvision.adapter")
 
+# ITSM deep-link prefixes used when a PRB/HIIM id is saved without an explicit link
+PRB_LINK_PREFIX = "https://unity.itsm.socgen/saw/Problem/"
+HIIM_LINK_PREFIX = "https://unity.itsm.socgen/saw/custom/HighImpactIncident_c/details/"
+
+# Every writable column of the entries table (all but the AUTOINCREMENT id), in schema order
+ENTRY_COLUMNS = (
+    'date', 'day', 'application_name', 'row_type', 'grouping_key', 'row_position',
+    'prc_mail_text', 'prc_mail_status', 'cp_alerts_text', 'cp_alerts_status',
+    'quality_status', 'quality_legacy', 'quality_target', 'remarks',
+    'valo_text', 'valo_status', 'sensi_text', 'sensi_status', 'cf_ra_text', 'cf_ra_status',
+    'acq_text', 'root_cause_application', 'root_cause_type', 'xva_remarks',
+    'closing', 'iteration', 'reg_issue', 'action_taken_and_update', 'reg_status',
+    'reg_prb', 'reg_hiim', 'backlog_item',
+    'timings', 'timings_status', 'puntuality_issue', 'quality', 'quality_issue',
+    'others_prb', 'others_hiim', 'business_chain',
+    'prb_id_number', 'prb_id_status', 'prb_link',
+    'hiim_id_number', 'hiim_id_status', 'hiim_link',
+    'issue_description', 'time_loss', 'infra_weekend_manual',
+    'created_at', 'updated_at',
+)
+# Built once so every insert reuses the same statement (and sqlite3's prepared-statement cache)
+INSERT_ENTRY_SQL = f"INSERT INTO entries ({', '.join(ENTRY_COLUMNS)}) VALUES ({', '.join('?' * len(ENTRY_COLUMNS))})"
+# A row dict laid over these defaults yields its INSERT parameters in one C-level itemgetter
+# call; columns the row does not set are stored as NULL
+ENTRY_COLUMN_DEFAULTS = dict.fromkeys(ENTRY_COLUMNS)
+_entry_values = itemgetter(*ENTRY_COLUMNS)
+# Reads name every schema column (id first) so rows zip against a known layout without
+# consulting cursor.description, and stray legacy columns are never carried into responses
+READ_COLUMNS = ('id',) + ENTRY_COLUMNS
+SELECT_ENTRIES_SQL = f"SELECT {', '.join(READ_COLUMNS)} FROM entries"
+
+# Per-entry text fields copied onto every row of a new entry ('' when not supplied)
+COMMON_TEXT_FIELDS = (
+    'day',
+    'prc_mail_text', 'prc_mail_status', 'cp_alerts_text', 'cp_alerts_status',
+    'quality_status', 'quality_legacy', 'quality_target', 'remarks',
+    'valo_text', 'valo_status', 'sensi_text', 'sensi_status', 'cf_ra_text', 'cf_ra_status',
+    'acq_text', 'root_cause_application', 'root_cause_type', 'xva_remarks',
+    'closing', 'iteration', 'reg_issue', 'action_taken_and_update', 'reg_status',
+    'reg_prb', 'reg_hiim', 'backlog_item',
+    'timings', 'timings_status', 'puntuality_issue', 'quality', 'quality_issue',
+    'others_prb', 'others_hiim', 'business_chain',
+)
+
+# Common fields copied from the main row when a PRB/HIIM/issue row is added during an update
+RELATED_ROW_COMMON_FIELDS = (
+    'prc_mail_text', 'prc_mail_status', 'cp_alerts_text', 'cp_alerts_status',
+    'quality_status', 'quality_legacy', 'quality_target', 'remarks',
+    'valo_text', 'valo_status', 'sensi_text', 'sensi_status',
+    'cf_ra_text', 'cf_ra_status', 'acq_text', 'root_cause_application',
+    'root_cause_type', 'xva_remarks', 'closing', 'iteration', 'reg_issue',
+    'action_taken_and_update', 'reg_status', 'reg_prb', 'reg_hiim',
+    'backlog_item', 'timings', 'puntuality_issue', 'quality',
+    'quality_issue', 'others_prb', 'others_hiim',
+)
+# Reads only the main-row columns a new related row inherits
+MAIN_ROW_INHERITED_SQL = (
+    f"SELECT date, day, application_name, {', '.join(RELATED_ROW_COMMON_FIELDS)} "
+    "FROM entries WHERE grouping_key = ? AND row_type = 'main' LIMIT 1"
+)
+
+# Number of (application, start_date, end_date) dashboard reads kept in memory per database
+ENTRIES_CACHE_SIZE = 64
+
+# Stored in PRAGMA user_version once init_database has brought a file up to date; bump it
+# whenever the table, column or index set changes so existing databases migrate again
+SCHEMA_VERSION = 3
+
+# Connections per database; a borrower waits when all of them are in use
+CONNECTION_POOL_SIZE = 4
+
+# Page cache budget for one database, split across its pooled connections (each connection
+# keeps a private cache, so a per-connection size would be multiplied by pool x databases)
+PAGE_CACHE_KB_PER_DATABASE = 16000
+
 class IndependentRowSQLiteAdapter:
     """SQLite adapter with independent row structure - no parent-child dependencies"""
     
@@ -19,6 +102,24 @@ class IndependentRowSQLiteAdapter:
         self.local_db_path = f"./data/{db_name}"
         self.ensure_data_directory()
         
+        # Long-lived pooled connections, most recently returned first so the warmest page
+        # cache is reused. WAL lets readers run side by side; writes are serialized through
+        # _write_connection() (SQLite allows one writer at a time anyway). The semaphore caps
+        # borrowed connections at the pool size so the page cache budget holds under load.
+        self._pool = queue.LifoQueue(maxsize=CONNECTION_POOL_SIZE)
+        self._pool_slots = threading.BoundedSemaphore(CONNECTION_POOL_SIZE)
+        self._write_lock = threading.RLock()
+        self._cache_lock = threading.Lock()
+        
+        # Grouped dashboard reads, most recently used last. Every write clears it and
+        # bumps the generation so a read that raced a write never repopulates stale data.
+        # Commits from other processes (or other adapters on the same file) are caught by
+        # PRAGMA data_version on a dedicated connection that never writes.
+        self._entries_cache = OrderedDict()
+        self._entries_cache_generation = 0
+        self._watch_conn = None
+        self._entries_cache_data_version = None
+        
         # Initialize local database
         self.init_database()
     
@@ -33,6 +134,14 @@ class IndependentRowSQLiteAdapter:
         conn = sqlite3.connect(self.local_db_path)
         cursor = conn.cursor()
         
+        # Databases already at the current schema skip the table_info scan, ALTERs and index DDL
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            conn.close()
+            return
+        
+        # WAL is persistent in the database file, so it only needs to be set once here
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Create entries table - each row is completely independent
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS entries (
@@ -86,7 +195,6 @@ class IndependentRowSQLiteAdapter:
                 timings_status TEXT,
                 puntuality_issue TEXT,
                 quality TEXT,
-                quality_status TEXT,
                 quality_issue TEXT,
                 others_prb TEXT,
                 others_hiim TEXT,
@@ -119,13 +227,26 @@ class IndependentRowSQLiteAdapter:
             )
         ''')
         
-        # Create settings table
+        # Create settings table. WITHOUT ROWID stores each value in the primary-key B-tree
+        # itself instead of a rowid table plus a separate index on key; databases created
+        # before that are rebuilt once, keeping their rows, in one transaction
+        settings_table = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'settings'"
+        ).fetchone()
+        rebuild_settings = settings_table is not None and 'WITHOUT ROWID' not in settings_table[0].upper()
+        if rebuild_settings:
+            cursor.execute("BEGIN")
+            cursor.execute("ALTER TABLE settings RENAME TO settings_rowid")
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS settings (
                 key TEXT PRIMARY KEY,
                 value TEXT
-            )
+            ) WITHOUT ROWID
         ''')
+        if rebuild_settings:
+            cursor.execute("INSERT INTO settings (key, value) SELECT key, value FROM settings_rowid")
+            cursor.execute("DROP TABLE settings_rowid")
+            conn.commit()
         
         # Create indexes for performance
         # First check if required columns exist and add them for backward compatibility
@@ -148,25 +269,123 @@ class IndependentRowSQLiteAdapter:
             if column_name not in columns:
                 cursor.execute(f"ALTER TABLE entries ADD COLUMN {column_name} {column_def}")
         
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_grouping_key ON entries(grouping_key)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_date_app ON entries(date, application_name)")
+        # Composite index serves every per-group lookup (grouping_key + row_type [+ row_position]);
+        # without it the planner falls back to the low-selectivity row_type index
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_grouping_type ON entries(grouping_key, row_type, row_position)")
+        # Superseded by idx_entries_grouping_type (same leading column)
+        cursor.execute("DROP INDEX IF EXISTS idx_entries_grouping_key")
+        # Dashboard reads filter on application_name = ? plus a date range and order by
+        # date DESC, grouping_key, row_position: this index serves the filter and the order
+        # (no sort step), and also the (application_name, date) equality lookups
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_app_date_group "
+                       "ON entries(application_name, date DESC, grouping_key, row_position)")
+        # Superseded by idx_entries_app_date_group (equality on application_name comes first)
+        cursor.execute("DROP INDEX IF EXISTS idx_entries_date_app")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_row_type ON entries(row_type)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date)")
         
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
         conn.close()
     
     def get_connection(self):
-        """Get database connection with proper consistency settings"""
-        conn = sqlite3.connect(self.local_db_path)
+        """Take an idle pooled connection, opening one with proper consistency settings if none is free"""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        # Dynamic UPDATE column lists and NOT IN (...) arities produce many distinct statements;
+        # a larger statement cache keeps the fixed queries prepared alongside them
+        conn = sqlite3.connect(self.local_db_path, check_same_thread=False, cached_statements=256)
         # Ensure immediate consistency and proper transaction handling
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=FULL") 
+        # (journal_mode=WAL is set once in init_database). In WAL mode NORMAL only
+        # syncs at checkpoints: a power loss can drop the last commits but never corrupts.
+        # Deployments that need every commit on disk set SQLITE_SYNCHRONOUS = 'FULL' in config.
+        conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size=-{PAGE_CACHE_KB_PER_DATABASE // CONNECTION_POOL_SIZE}")
+        # Mapped pages live in the OS page cache and are shared by every connection to the file
+        conn.execute("PRAGMA mmap_size=67108864")  # 64 MB memory-mapped reads
+        conn.execute("PRAGMA temp_store=MEMORY")
         conn.execute("PRAGMA read_uncommitted=0")
         # Enable foreign key constraints for data integrity
         conn.execute("PRAGMA foreign_keys=ON")
         return conn
     
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection for the duration of a with-block, waiting if all are in use"""
+        with self._pool_slots:
+            conn = self.get_connection()
+            try:
+                yield conn
+            finally:
+                # Never hand an open transaction to the next borrower
+                if conn.in_transaction:
+                    conn.rollback()
+                try:
+                    self._pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+    
+    @contextmanager
+    def _write_connection(self):
+        """
+        Borrow a connection for a write, one writer at a time
+        Cached reads are dropped once the write has finished (committed or rolled back), so a
+        read that started before the commit can never be cached afterwards
+        """
+        with self._write_lock:
+            with self._connection() as conn:
+                changes = conn.total_changes
+                try:
+                    yield conn
+                finally:
+                    if conn.total_changes != changes:
+                        self._invalidate_entries_cache()
+    
+    def close(self):
+        """Close the idle pooled connections (new ones are opened on next use)"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._cache_lock:
+            if self._watch_conn is not None:
+                self._watch_conn.close()
+                self._watch_conn = None
+                self._entries_cache_data_version = None
+    
+    def _check_external_changes(self):
+        """
+        Drop cached reads if any other connection committed since the last check
+        data_version is per connection and changes on commits made through any other connection,
+        so it is read from a connection reserved for this; caller holds _cache_lock
+        """
+        if self._watch_conn is None:
+            self._watch_conn = sqlite3.connect(self.local_db_path, check_same_thread=False,
+                                               isolation_level=None)
+        data_version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._entries_cache_data_version:
+            self._entries_cache.clear()
+            self._entries_cache_generation += 1
+            self._entries_cache_data_version = data_version
+    
+    def _invalidate_entries_cache(self):
+        """Drop cached dashboard reads and bump the generation; called after every write"""
+        with self._cache_lock:
+            self._entries_cache.clear()
+            self._entries_cache_generation += 1
+    
+    @staticmethod
+    def _copy_entries(entries: List[Dict]) -> List[Dict]:
+        """Copy grouped entries down to the nested rows so callers cannot alter the cache"""
+        return [dict(entry,
+                     prbs=[dict(prb) for prb in entry['prbs']],
+                     hiims=[dict(hiim) for hiim in entry['hiims']],
+                     issues=[dict(issue) for issue in entry['issues']])
+                for entry in entries]
+    
     def generate_grouping_key(self, date: str, application_name: str) -> str:
         """Generate grouping key for UI display grouping"""
         return f"{date}_{application_name}"
@@ -180,227 +399,192 @@ class IndependentRowSQLiteAdapter:
         
         Each will be stored as independent rows
         """
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            now = datetime.utcnow().isoformat()
-            date = entry_data.get('date', '')
-            application_name = entry_data.get('application_name', '')
-            # Ensure grouping_key always matches the date field
-            correct_grouping_key = self.generate_grouping_key(date, application_name)
-            # If grouping_key is present and does not match, override it
-            if entry_data.get('grouping_key') != correct_grouping_key:
-                entry_data['grouping_key'] = correct_grouping_key
-            grouping_key = correct_grouping_key
-            
-            # Common data to be duplicated across all rows (excluding time_loss which is item-specific)
-            common_data = {
-                'date': date,
-                'day': entry_data.get('day', ''),
-                'application_name': application_name,
-                'grouping_key': grouping_key,
-                'prc_mail_text': entry_data.get('prc_mail_text', ''),
-                'prc_mail_status': entry_data.get('prc_mail_status', ''),
-                'cp_alerts_text': entry_data.get('cp_alerts_text', ''),
-                'cp_alerts_status': entry_data.get('cp_alerts_status', ''),
-                'quality_status': entry_data.get('quality_status', ''),
-                'quality_legacy': entry_data.get('quality_legacy', ''),
-                'quality_target': entry_data.get('quality_target', ''),
-                'remarks': entry_data.get('remarks', ''),
-                'valo_text': entry_data.get('valo_text', ''),
-                'valo_status': entry_data.get('valo_status', ''),
-                'sensi_text': entry_data.get('sensi_text', ''),
-                'sensi_status': entry_data.get('sensi_status', ''),
-                'cf_ra_text': entry_data.get('cf_ra_text', ''),
-                'cf_ra_status': entry_data.get('cf_ra_status', ''),
-                'acq_text': entry_data.get('acq_text', ''),
-                'root_cause_application': entry_data.get('root_cause_application', ''),
-                'root_cause_type': entry_data.get('root_cause_type', ''),
-                'xva_remarks': entry_data.get('xva_remarks', ''),
-                'closing': entry_data.get('closing', ''),
-                'iteration': entry_data.get('iteration', ''),
-                'reg_issue': entry_data.get('reg_issue', ''),
-                'action_taken_and_update': entry_data.get('action_taken_and_update', ''),
-                'reg_status': entry_data.get('reg_status', ''),
-                'reg_prb': entry_data.get('reg_prb', ''),
-                'reg_hiim': entry_data.get('reg_hiim', ''),
-                'backlog_item': entry_data.get('backlog_item', ''),
-
-                'timings': entry_data.get('timings', ''),
-                'timings_status': entry_data.get('timings_status', ''),
-                'puntuality_issue': entry_data.get('puntuality_issue', ''),
-                'quality': entry_data.get('quality', ''),
-                'quality_status': entry_data.get('quality_status', ''),
-                'quality_issue': entry_data.get('quality_issue', ''),
-                'others_prb': entry_data.get('others_prb', ''),
-                'others_hiim': entry_data.get('others_hiim', ''),
-                'business_chain': entry_data.get('business_chain', ''),
-                # time_loss removed from common_data - it should be specific to each issue
-                'infra_weekend_manual': entry_data.get('infra_weekend_manual'),
-                'created_at': now,
-                'updated_at': now
+        with self._write_connection() as conn:
+            try:
+                cursor = conn.cursor()
+                
+                entry_rows = self._build_entry_rows(entry_data, datetime.utcnow().isoformat())
+                # Take the write lock up front so the main row and its PRB/HIIM/issue rows
+                # commit together without upgrading a read lock (SQLITE_BUSY) mid-entry
+                cursor.execute("BEGIN IMMEDIATE")
+                self._insert_rows(cursor, entry_rows)
+                
+                conn.commit()
+                return self._entry_result(entry_rows)
+                
+            except Exception as e:
+                conn.rollback()
+                logger.error("Error creating entry: %s", e, exc_info=True)
+                raise e
+    
+    def _build_entry_rows(self, entry_data: Dict, now: str) -> List[Dict]:
+        """Build the main row followed by the PRB/HIIM/Issue rows for one logical entry"""
+        date = entry_data.get('date', '')
+        application_name = entry_data.get('application_name', '')
+        # Ensure grouping_key always matches the date field
+        correct_grouping_key = self.generate_grouping_key(date, application_name)
+        # If grouping_key is present and does not match, override it
+        if entry_data.get('grouping_key') != correct_grouping_key:
+            entry_data['grouping_key'] = correct_grouping_key
+        grouping_key = correct_grouping_key
+        
+        # Common data to be duplicated across all rows (excluding time_loss which is item-specific)
+        common_data = {field: entry_data.get(field, '') for field in COMMON_TEXT_FIELDS}
+        common_data.update({
+            'date': date,
+            'application_name': application_name,
+            'grouping_key': grouping_key,
+            # time_loss is not common data - it should be specific to each issue
+            'infra_weekend_manual': entry_data.get('infra_weekend_manual'),
+            'created_at': now,
+            'updated_at': now
+        })
+        
+        created_entries = []
+        
+        # Create main entry (handles legacy single-value fields only if no arrays present)
+        prbs_array = entry_data.get('prbs', [])
+        hiims_array = entry_data.get('hiims', [])
+        issues_array = entry_data.get('issues', [])
+        
+        # Only include legacy PRB/HIIM data in main entry if no arrays are provided
+        main_prb_id = entry_data.get('prb_id_number', '') if not prbs_array else ''
+        main_prb_status = entry_data.get('prb_id_status', '') if not prbs_array else ''
+        main_prb_link = entry_data.get('prb_link', '') if not prbs_array else ''
+        if not main_prb_link and main_prb_id:
+            main_prb_link = f"{PRB_LINK_PREFIX}{main_prb_id}/general"
+        main_hiim_id = entry_data.get('hiim_id_number', '') if not hiims_array else ''
+        main_hiim_status = entry_data.get('hiim_id_status', '') if not hiims_array else ''
+        main_hiim_link = entry_data.get('hiim_link', '') if not hiims_array else ''
+        if not main_hiim_link and main_hiim_id:
+            main_hiim_link = f"{HIIM_LINK_PREFIX}{main_hiim_id}/general"
+        main_issue_desc = entry_data.get('issue_description', '') if not issues_array else ''
+        
+        main_entry = {
+            **common_data,
+            'row_type': 'main',
+            'row_position': 0,
+            'prb_id_number': main_prb_id,
+            'prb_id_status': main_prb_status,
+            'prb_link': main_prb_link,
+            'hiim_id_number': main_hiim_id,
+            'hiim_id_status': main_hiim_status,
+            'hiim_link': main_hiim_link,
+            'issue_description': main_issue_desc,
+            'time_loss': entry_data.get('time_loss', '') if not issues_array else '',  # Only use legacy time_loss if no issues array
+        }
+        
+        created_entries.append(main_entry)
+        
+        # Create independent rows with position representing Item Set number
+        # Create PRBs with Item Set position alignment
+        for item_set_position, prb in enumerate(prbs_array):
+            if prb is None:
+                # Skip None placeholders during creation
+                continue
+                
+            prb_id = str(prb.get('prb_id_number', '')) if prb.get('prb_id_number') is not None else ''
+            prb_link = prb.get('prb_link', '')
+            if not prb_link and prb_id:
+                prb_link = f"{PRB_LINK_PREFIX}{prb_id}/general"
+            prb_entry = {
+                **common_data,
+                'row_type': 'prb',
+                'row_position': item_set_position,  # This represents Item Set number (0, 1, 2, etc.)
+                'prb_id_number': prb_id,
+                'prb_id_status': prb.get('prb_id_status', ''),
+                'prb_link': prb_link,
+                # Clear other type-specific fields for independence
+                'hiim_id_number': '',
+                'hiim_id_status': '',
+                'hiim_link': '',
+                'issue_description': '',
+                'time_loss': '',  # PRBs don't have time_loss
             }
-            
-            created_entries = []
-            
-            # Create main entry (handles legacy single-value fields only if no arrays present)
-            prbs_array = entry_data.get('prbs', [])
-            hiims_array = entry_data.get('hiims', [])
-            issues_array = entry_data.get('issues', [])
-            
-            # Only include legacy PRB/HIIM data in main entry if no arrays are provided
-            main_prb_id = entry_data.get('prb_id_number', '') if not prbs_array else ''
-            main_prb_status = entry_data.get('prb_id_status', '') if not prbs_array else ''
-            main_prb_link = entry_data.get('prb_link', '') if not prbs_array else ''
-            if not main_prb_link and main_prb_id:
-                main_prb_link = f"https://unity.itsm.socgen/saw/Problem/{main_prb_id}/general"
-            main_hiim_id = entry_data.get('hiim_id_number', '') if not hiims_array else ''
-            main_hiim_status = entry_data.get('hiim_id_status', '') if not hiims_array else ''
-            main_hiim_link = entry_data.get('hiim_link', '') if not hiims_array else ''
-            if not main_hiim_link and main_hiim_id:
-                main_hiim_link = f"https://unity.itsm.socgen/saw/custom/HighImpactIncident_c/details/{main_hiim_id}/general"
-            main_issue_desc = entry_data.get('issue_description', '') if not issues_array else ''
-            
-            main_entry = {
+            created_entries.append(prb_entry)
+        
+        # Create HIIMs with Item Set position alignment  
+        for item_set_position, hiim in enumerate(hiims_array):
+            if hiim is None:
+                # Skip None placeholders during creation
+                continue
+                
+            hiim_id = str(hiim.get('hiim_id_number', '')) if hiim.get('hiim_id_number') is not None else ''
+            hiim_link = hiim.get('hiim_link', '')
+            if not hiim_link and hiim_id:
+                hiim_link = f"{HIIM_LINK_PREFIX}{hiim_id}/general"
+            hiim_entry = {
                 **common_data,
-                'row_type': 'main',
-                'row_position': 0,
-                'prb_id_number': main_prb_id,
-                'prb_id_status': main_prb_status,
-                'prb_link': main_prb_link,
-                'hiim_id_number': main_hiim_id,
-                'hiim_id_status': main_hiim_status,
-                'hiim_link': main_hiim_link,
-                'issue_description': main_issue_desc,
-                'time_loss': entry_data.get('time_loss', '') if not issues_array else '',  # Only use legacy time_loss if no issues array
+                'row_type': 'hiim',
+                'row_position': item_set_position,  # This represents Item Set number (0, 1, 2, etc.)
+                'hiim_id_number': hiim_id,
+                'hiim_id_status': hiim.get('hiim_id_status', ''),
+                'hiim_link': hiim_link,
+                # Clear other type-specific fields for independence
+                'prb_id_number': '',
+                'prb_id_status': '',
+                'prb_link': '',
+                'issue_description': '',
+                'time_loss': '',  # HIIMs don't have time_loss
             }
-            
-            entry_id = self._insert_row(cursor, main_entry)
-            main_entry['id'] = entry_id
-            created_entries.append(main_entry)
-            
-            # Create independent rows with position representing Item Set number
-            # Create PRBs with Item Set position alignment
-            for item_set_position, prb in enumerate(prbs_array):
-                if prb is None:
-                    # Skip None placeholders during creation
-                    continue
-                    
-                prb_id = str(prb.get('prb_id_number', '')) if prb.get('prb_id_number') is not None else ''
-                prb_link = prb.get('prb_link', '')
-                if not prb_link and prb_id:
-                    prb_link = f"https://unity.itsm.socgen/saw/Problem/{prb_id}/general"
-                prb_entry = {
-                    **common_data,
-                    'row_type': 'prb',
-                    'row_position': item_set_position,  # This represents Item Set number (0, 1, 2, etc.)
-                    'prb_id_number': prb_id,
-                    'prb_id_status': prb.get('prb_id_status', ''),
-                    'prb_link': prb_link,
-                    # Clear other type-specific fields for independence
-                    'hiim_id_number': '',
-                    'hiim_id_status': '',
-                    'hiim_link': '',
-                    'issue_description': '',
-                    'time_loss': '',  # PRBs don't have time_loss
-                }
-                entry_id = self._insert_row(cursor, prb_entry)
-                prb_entry['id'] = entry_id
-                created_entries.append(prb_entry)
-            
-            # Create HIIMs with Item Set position alignment  
-            for item_set_position, hiim in enumerate(hiims_array):
-                if hiim is None:
-                    # Skip None placeholders during creation
-                    continue
-                    
-                hiim_id = str(hiim.get('hiim_id_number', '')) if hiim.get('hiim_id_number') is not None else ''
-                hiim_link = hiim.get('hiim_link', '')
-                if not hiim_link and hiim_id:
-                    hiim_link = f"https://unity.itsm.socgen/saw/custom/HighImpactIncident_c/details/{hiim_id}/general"
-                hiim_entry = {
-                    **common_data,
-                    'row_type': 'hiim',
-                    'row_position': item_set_position,  # This represents Item Set number (0, 1, 2, etc.)
-                    'hiim_id_number': hiim_id,
-                    'hiim_id_status': hiim.get('hiim_id_status', ''),
-                    'hiim_link': hiim_link,
-                    # Clear other type-specific fields for independence
-                    'prb_id_number': '',
-                    'prb_id_status': '',
-                    'prb_link': '',
-                    'issue_description': '',
-                    'time_loss': '',  # HIIMs don't have time_loss
-                }
-                entry_id = self._insert_row(cursor, hiim_entry)
-                hiim_entry['id'] = entry_id
-                created_entries.append(hiim_entry)
-            
-            # Create Issues with Item Set position alignment
-            for item_set_position, issue in enumerate(issues_array):
-                if issue is None:
-                    # Skip None placeholders during creation
-                    continue
-                    
-                issue_entry = {
-                    **common_data,
-                    'row_type': 'issue',
-                    'row_position': item_set_position,  # This represents Item Set number (0, 1, 2, etc.)
-                    'issue_description': issue.get('description', ''),
-                    # Use only the issue's own time_loss value, no fallback to common data
-                    'time_loss': issue.get('time_loss', ''),
-                    # Clear other type-specific fields for independence
-                    'prb_id_number': '',
-                    'prb_id_status': '',
-                    'prb_link': '',
-                    'hiim_id_number': '',
-                    'hiim_id_status': '',
-                    'hiim_link': '',
-                }
+            created_entries.append(hiim_entry)
+        
+        # Create Issues with Item Set position alignment
+        for item_set_position, issue in enumerate(issues_array):
+            if issue is None:
+                # Skip None placeholders during creation
+                continue
                 
-                entry_id = self._insert_row(cursor, issue_entry)
-                issue_entry['id'] = entry_id
-                created_entries.append(issue_entry)
-            
-            conn.commit()
-            
-            # Return the main entry with attached arrays for API compatibility
-            result = created_entries[0].copy()  # Main entry
-            result['prbs'] = [e for e in created_entries if e['row_type'] == 'prb']
-            result['hiims'] = [e for e in created_entries if e['row_type'] == 'hiim']
-            result['issues'] = [{'description': e['issue_description'], 'time_loss': e.get('time_loss', ''), 'row_position': e.get('row_position', 0)} for e in created_entries if e['row_type'] == 'issue']
-            
-            return result
+            issue_entry = {
+                **common_data,
+                'row_type': 'issue',
+                'row_position': item_set_position,  # This represents Item Set number (0, 1, 2, etc.)
+                'issue_description': issue.get('description', ''),
+                # Use only the issue's own time_loss value, no fallback to common data
+                'time_loss': issue.get('time_loss', ''),
+                # Clear other type-specific fields for independence
+                'prb_id_number': '',
+                'prb_id_status': '',
+                'prb_link': '',
+                'hiim_id_number': '',
+                'hiim_id_status': '',
+                'hiim_link': '',
+            }
             
-        except Exception as e:
-            conn.rollback()
-            logger.error("Error creating entry: %s", e, exc_info=True)
-            raise e
-        finally:
-            conn.close()
+            created_entries.append(issue_entry)
+        
+        return created_entries
     
-    def _insert_row(self, cursor, row_data):
-        """Helper to insert a single row and return its ID"""
-        columns = list(row_data.keys())
-        placeholders = ', '.join(['?' for _ in columns])
-        column_names = ', '.join(columns)
-        values = [row_data[col] for col in columns]
-        
-        query = f"INSERT INTO entries ({column_names}) VALUES ({placeholders})"
-        cursor.execute(query, values)
-        return cursor.lastrowid
+    def _entry_result(self, created_entries: List[Dict]) -> Dict:
+        """Return the main entry with attached arrays for API compatibility"""
+        result = created_entries[0].copy()  # Main entry
+        result['prbs'] = [e for e in created_entries if e['row_type'] == 'prb']
+        result['hiims'] = [e for e in created_entries if e['row_type'] == 'hiim']
+        result['issues'] = [{'description': e['issue_description'], 'time_loss': e.get('time_loss', ''), 'row_position': e.get('row_position', 0)} for e in created_entries if e['row_type'] == 'issue']
+        
+        return result
+    
+    def _insert_rows(self, cursor, rows: List[Dict]):
+        """
+        Insert rows with a single executemany and set each row's 'id'
+        Rows are inserted back to back inside the caller's write transaction, so the
+        AUTOINCREMENT ids are contiguous and end at last_insert_rowid()
+        """
+        if not rows:
+            return
+        cursor.executemany(INSERT_ENTRY_SQL, [_entry_values({**ENTRY_COLUMN_DEFAULTS, **row}) for row in rows])
+        
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        for offset, row in enumerate(rows):
+            row['id'] = last_id - len(rows) + 1 + offset
     
     def get_entries_by_application(self, application_name: str, start_date: str = None, end_date: str = None) -> List[Dict]:
         """
         Get independent entries and group them for UI display compatibility
         Returns entries grouped by date with arrays for multiple PRBs/HIIMs/Issues
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         # Build query
-        query = "SELECT * FROM entries WHERE application_name = ?"
+        query = f"{SELECT_ENTRIES_SQL} WHERE application_name = ?"
         params = [application_name]
         
         if start_date:
@@ -413,9 +597,19 @@ class IndependentRowSQLiteAdapter:
         
         query += " ORDER BY date DESC, grouping_key, row_position"
         
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        all_rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        cache_key = (application_name, start_date, end_date)
+        with self._cache_lock:
+            self._check_external_changes()
+            cached = self._entries_cache.get(cache_key)
+            if cached is not None:
+                self._entries_cache.move_to_end(cache_key)
+            generation = self._entries_cache_generation
+        if cached is not None:
+            return self._copy_entries(cached)
+        
+        with self._connection() as conn:
+            cursor = conn.execute(query, params)
+            all_rows = [dict(zip(READ_COLUMNS, row)) for row in cursor]
         
         # Group independent rows by grouping_key for UI display
         grouped_entries = {}
@@ -504,8 +698,37 @@ class IndependentRowSQLiteAdapter:
                     
                     result_entries.append(enriched_row)
         
-        conn.close()
-        return result_entries
+        with self._cache_lock:
+            if generation == self._entries_cache_generation:
+                self._entries_cache[cache_key] = result_entries
+                if len(self._entries_cache) > ENTRIES_CACHE_SIZE:
+                    self._entries_cache.popitem(last=False)
+        return self._copy_entries(result_entries)
+
+    def has_entry_on_date(self, application_name: str, date: str, exclude_id: int = None) -> bool:
+        """
+        Check whether the application already has an entry for this date
+        Matches what get_entries_by_application would return: the main row's date, or for a
+        group with no main row its PRB/HIIM rows and (when one of those exists) its issue
+        rows, which are listed without an id and so are never excluded by exclude_id
+        """
+        with self._connection() as conn:
+            row = conn.execute(
+                """
+                SELECT 1 FROM entries AS e
+                WHERE e.application_name = ? AND e.date = ?
+                  AND (e.row_type = 'issue' OR e.id IS NOT ?)
+                  AND (e.row_type = 'main' OR (
+                      NOT EXISTS (
+                          SELECT 1 FROM entries AS m WHERE m.grouping_key = e.grouping_key AND m.row_type = 'main')
+                      AND (e.row_type != 'issue' OR EXISTS (
+                          SELECT 1 FROM entries AS r
+                          WHERE r.grouping_key = e.grouping_key AND r.row_type IN ('prb', 'hiim')))))
+                LIMIT 1
+                """,
+                (application_name, date, exclude_id)
+            ).fetchone()
+        return row is not None
 
     def get_individual_rows_by_application(self, application_name: str, start_date: str = None, end_date: str = None, 
                                          row_type_filter: str = None) -> List[Dict]:
@@ -513,11 +736,8 @@ class IndependentRowSQLiteAdapter:
         Get individual rows without grouping for row-level filtering
         Used when filters need to work at individual row level (e.g., PRB only, HIIM only)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         # Build query
-        query = "SELECT * FROM entries WHERE application_name = ?"
+        query = f"{SELECT_ENTRIES_SQL} WHERE application_name = ?"
         params = [application_name]
         
         if start_date:
@@ -574,15 +794,15 @@ class IndependentRowSQLiteAdapter:
         
         query += " ORDER BY date DESC, grouping_key, row_position"
         
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        all_rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        with self._connection() as conn:
+            cursor = conn.execute(query, params)
+            all_rows = [dict(zip(READ_COLUMNS, row)) for row in cursor]
         
         # Convert rows to API-compatible format with individual row data
         result_entries = []
         for row in all_rows:
-            # Create a formatted entry for each individual row
-            formatted_row = row.copy()
+            # Each row dict is freshly built above, so it is extended in place rather than copied
+            formatted_row = row
             
             # Add compatibility fields for frontend
             if row['row_type'] == 'prb':
@@ -605,7 +825,6 @@ class IndependentRowSQLiteAdapter:
             
             result_entries.append(formatted_row)
         
-        conn.close()
         return result_entries
     
     def update_entry(self, entry_id: int, entry_data: Dict, application_name: str = None) -> Optional[Dict]:
@@ -613,35 +832,37 @@ class IndependentRowSQLiteAdapter:
         Comprehensive update for independent entries
         Handles updating main entry and managing related PRBs/HIIMs/issues
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            # Get current entry to understand its structure
-            cursor.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-            row = cursor.fetchone()
-            if not row:
-                conn.close()
-                return None
-            
-            columns = [description[0] for description in cursor.description]
-            current_entry = dict(zip(columns, row))
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
             
-            # If this is a main entry, we need to handle comprehensive updates
-            if current_entry['row_type'] == 'main':
-                return self._update_main_entry_comprehensive(cursor, entry_id, entry_data, current_entry)
-            else:
-                # For non-main entries, just update the single row
-                return self._update_single_row(cursor, entry_id, entry_data)
+            try:
+                # Get current entry to understand its structure; only a few columns are read,
+                # so look them up by name on a Row instead of building a dict of every column
+                lookup = conn.cursor()
+                lookup.row_factory = sqlite3.Row
+                current_entry = lookup.execute(
+                    "SELECT row_type, grouping_key, date, application_name FROM entries WHERE id = ?", (entry_id,)
+                ).fetchone()
+                if not current_entry:
+                    return None
                 
-        except Exception as e:
-            conn.rollback()
-            logger.error("Error updating entry %s: %s", entry_id, e, exc_info=True)
-            return None
-        finally:
-            conn.close()
+                # One timestamp for every row touched by this update
+                now = datetime.utcnow().isoformat()
+                
+                # If this is a main entry, we need to handle comprehensive updates
+                if current_entry['row_type'] == 'main':
+                    return self._update_main_entry_comprehensive(cursor, entry_id, entry_data, current_entry, now)
+                else:
+                    # For non-main entries, just update the single row
+                    return self._update_single_row(cursor, entry_id, entry_data, now)
+                    
+            except Exception as e:
+                conn.rollback()
+                logger.error("Error updating entry %s: %s", entry_id, e, exc_info=True)
+                return None
     
-    def _update_main_entry_comprehensive(self, cursor, entry_id: int, entry_data: Dict, current_entry: Dict) -> Optional[Dict]:
+    def _update_main_entry_comprehensive(self, cursor, entry_id: int, entry_data: Dict, current_entry: sqlite3.Row,
+                                         now: str) -> Optional[Dict]:
         """Handle comprehensive update of main entry and all related data"""
         try:
             # Get the grouping key for this entry
@@ -664,75 +885,84 @@ class IndependentRowSQLiteAdapter:
                     update_values.append(value)
                 
                 update_fields.append("updated_at = ?")
-                update_values.append(datetime.utcnow().isoformat())
+                update_values.append(now)
                 update_values.append(entry_id)
                 
                 query = f"UPDATE entries SET {', '.join(update_fields)} WHERE id = ?"
                 cursor.execute(query, update_values)
             
             # 2. Handle PRBs
-            self._update_related_rows(cursor, grouping_key, 'prb', entry_data.get('prbs', []))
+            self._update_related_rows(cursor, grouping_key, 'prb', entry_data.get('prbs', []), now)
             
             # 3. Handle HIIMs  
-            self._update_related_rows(cursor, grouping_key, 'hiim', entry_data.get('hiims', []))
+            self._update_related_rows(cursor, grouping_key, 'hiim', entry_data.get('hiims', []), now)
             
             # 4. Handle Issues
-            self._update_related_rows(cursor, grouping_key, 'issue', entry_data.get('issues', []))
+            self._update_related_rows(cursor, grouping_key, 'issue', entry_data.get('issues', []), now)
             
             cursor.connection.commit()
             
-            # Return the updated entry with all related data
-            return self.get_entry_by_id(entry_id)
+            # Return the updated entry with all related data, read back on the same cursor
+            return self._fetch_entry(cursor, entry_id)
             
         except Exception as e:
             cursor.connection.rollback()
             raise e
     
-    def _update_related_rows(self, cursor, grouping_key: str, row_type: str, new_data: List[Dict]):
+    def _update_related_rows(self, cursor, grouping_key: str, row_type: str, new_data: List[Dict], now: str):
         """Update related rows (PRBs, HIIMs, issues) for a grouping key"""
-        # Get existing rows of this type
+        # Get existing rows of this type with their current Item Set positions
         cursor.execute(
-            "SELECT id FROM entries WHERE grouping_key = ? AND row_type = ?",
+            "SELECT id, row_position FROM entries WHERE grouping_key = ? AND row_type = ?",
             (grouping_key, row_type)
         )
-        existing_ids = [row[0] for row in cursor.fetchall()]
+        positions = dict(cursor)
         
-        # Track which IDs are being kept
+        # Track which IDs are being kept, which were dropped by an empty slot, and which
+        # items need new rows
         updated_ids = []
+        cleared_ids = set()
+        new_items = []
         
         # Process new data - maintain Item Set position alignment
         for i, item_data in enumerate(new_data):
             if item_data is None:
-                # Handle empty slots: delete any existing row at this position
-                cursor.execute(
-                    "DELETE FROM entries WHERE grouping_key = ? AND row_type = ? AND row_position = ?",
-                    (grouping_key, row_type, i)
-                )
+                # Handle empty slots: whatever row currently sits at this position is dropped;
+                # it is left out of updated_ids so the final delete below removes it
+                for row_id in [row_id for row_id, position in positions.items() if position == i]:
+                    del positions[row_id]
+                    cleared_ids.add(row_id)
+                continue
+            
+            if item_data.get('id') in cleared_ids:
+                # Already dropped by an earlier empty slot
                 continue
                 
-            if 'id' in item_data and item_data['id'] in existing_ids:
-                # Update existing row and ensure correct position
-                self._update_existing_related_row(cursor, item_data['id'], item_data, row_type)
-                # Update position to match Item Set alignment
-                cursor.execute(
-                    "UPDATE entries SET row_position = ? WHERE id = ?",
-                    (i, item_data['id'])
-                )
+            if 'id' in item_data and item_data['id'] in positions:
+                # Update existing row and move it to its Item Set position in the same statement
+                self._update_existing_related_row(cursor, item_data['id'], item_data, row_type, i, now)
+                positions[item_data['id']] = i
                 updated_ids.append(item_data['id'])
             else:
-                # Create new row at correct Item Set position
-                new_id = self._create_new_related_row(cursor, grouping_key, item_data, row_type, i)
-                updated_ids.append(new_id)
-        
-        # Delete rows that are no longer needed
-        for existing_id in existing_ids:
-            if existing_id not in updated_ids:
-                cursor.execute("DELETE FROM entries WHERE id = ?", (existing_id,))
+                # New row at this Item Set position, inserted with the others below
+                new_items.append((i, item_data))
+        
+        # Delete rows that are no longer needed in one statement: every row of this type in
+        # the group that was not kept above
+        query = "DELETE FROM entries WHERE grouping_key = ? AND row_type = ?"
+        if updated_ids:
+            query += f" AND id NOT IN ({', '.join('?' * len(updated_ids))})"
+        cursor.execute(query, (grouping_key, row_type, *updated_ids))
+        
+        if new_items:
+            self._create_new_related_rows(cursor, grouping_key, new_items, row_type, now)
     
-    def _update_existing_related_row(self, cursor, row_id: int, item_data: Dict, row_type: str):
-        """Update an existing related row"""
-        update_fields = []
-        update_values = []
+    def _update_existing_related_row(self, cursor, row_id: int, item_data: Dict, row_type: str, position: int,
+                                     now: str):
+        """Update an existing related row and set its row_position"""
+        # Position always follows the Item Set alignment; updated_at only moves when data changes
+        update_fields = ["row_position = ?"]
+        update_values = [position]
         
         if row_type == 'prb':
             fields_map = {
@@ -767,85 +997,71 @@ class IndependentRowSQLiteAdapter:
                 update_fields.append(f"{field} = ?")
                 update_values.append(value)
         
-        if update_fields:
+        if len(update_fields) > 1:
             update_fields.append("updated_at = ?")
-            update_values.append(datetime.utcnow().isoformat())
-            update_values.append(row_id)
-            
-            query = f"UPDATE entries SET {', '.join(update_fields)} WHERE id = ?"
-            cursor.execute(query, update_values)
+            update_values.append(now)
+        update_values.append(row_id)
+        
+        query = f"UPDATE entries SET {', '.join(update_fields)} WHERE id = ?"
+        cursor.execute(query, update_values)
     
-    def _create_new_related_row(self, cursor, grouping_key: str, item_data: Dict, row_type: str, position: int) -> int:
-        """Create a new related row"""
+    def _create_new_related_rows(self, cursor, grouping_key: str, items: List[Tuple[int, Dict]], row_type: str,
+                                 now: str):
+        """Create new related rows from (position, item_data) pairs with one executemany"""
         # Get the main entry data for copying common fields
-        cursor.execute(
-            "SELECT * FROM entries WHERE grouping_key = ? AND row_type = 'main' LIMIT 1", 
-            (grouping_key,)
-        )
-        main_row = cursor.fetchone()
+        main_row = cursor.execute(MAIN_ROW_INHERITED_SQL, (grouping_key,)).fetchone()
         
         if not main_row:
             raise Exception(f"No main entry found for grouping_key: {grouping_key}")
         
-        columns = [description[0] for description in cursor.description]
-        main_data = dict(zip(columns, main_row))
-        
-        # Create new row data
-        new_row_data = {
-            'date': main_data['date'],
-            'day': main_data['day'],
-            'application_name': main_data['application_name'],
-            'row_type': row_type,
-            'grouping_key': grouping_key,
-            'row_position': position,
-            'created_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
-        }
-        
-        # Copy common fields from main entry
-        common_fields = [
-            'prc_mail_text', 'prc_mail_status', 'cp_alerts_text', 'cp_alerts_status',
-            'quality_status', 'quality_legacy', 'quality_target', 'remarks',
-            'valo_text', 'valo_status', 'sensi_text', 'sensi_status',
-            'cf_ra_text', 'cf_ra_status', 'acq_text', 'root_cause_application',
-            'root_cause_type', 'xva_remarks', 'closing', 'iteration', 'reg_issue',
-            'action_taken_and_update', 'reg_status', 'reg_prb', 'reg_hiim',
-            'backlog_item', 'timings', 'puntuality_issue', 'quality',
-            'quality_issue', 'others_prb', 'others_hiim'
-        ]
-        
-        for field in common_fields:
-            if field in main_data:
-                new_row_data[field] = main_data[field]
+        date, day, application_name, *common_values = main_row
         
-        # Set type-specific fields
-        if row_type == 'prb':
-            new_row_data.update({
-                'prb_id_number': item_data.get('prb_id_number'),
-                'prb_id_status': item_data.get('prb_id_status'),
-                'prb_link': item_data.get('prb_link')
-            })
-        elif row_type == 'hiim':
-            new_row_data.update({
-                'hiim_id_number': item_data.get('hiim_id_number'),
-                'hiim_id_status': item_data.get('hiim_id_status'),
-                'hiim_link': item_data.get('hiim_link')
-            })
-        elif row_type == 'issue':
-            # Handle time_loss properly - only set if there's a meaningful value
-            time_loss_value = item_data.get('time_loss', '')
-            if time_loss_value is None:
-                time_loss_value = ''
+        new_rows = []
+        for position, item_data in items:
+            # Create new row data
+            new_row_data = {
+                'date': date,
+                'day': day,
+                'application_name': application_name,
+                'row_type': row_type,
+                'grouping_key': grouping_key,
+                'row_position': position,
+                'created_at': now,
+                'updated_at': now
+            }
             
-            new_row_data.update({
-                'issue_description': item_data.get('description', item_data.get('issue_description')),
-                'time_loss': str(time_loss_value).strip()
-            })
+            # Copy common fields from main entry
+            new_row_data.update(zip(RELATED_ROW_COMMON_FIELDS, common_values))
+            
+            # Set type-specific fields
+            if row_type == 'prb':
+                new_row_data.update({
+                    'prb_id_number': item_data.get('prb_id_number'),
+                    'prb_id_status': item_data.get('prb_id_status'),
+                    'prb_link': item_data.get('prb_link')
+                })
+            elif row_type == 'hiim':
+                new_row_data.update({
+                    'hiim_id_number': item_data.get('hiim_id_number'),
+                    'hiim_id_status': item_data.get('hiim_id_status'),
+                    'hiim_link': item_data.get('hiim_link')
+                })
+            elif row_type == 'issue':
+                # Handle time_loss properly - only set if there's a meaningful value
+                time_loss_value = item_data.get('time_loss', '')
+                if time_loss_value is None:
+                    time_loss_value = ''
+            
+                new_row_data.update({
+                    'issue_description': item_data.get('description', item_data.get('issue_description')),
+                    'time_loss': str(time_loss_value).strip()
+                })
+            
+            new_rows.append(new_row_data)
         
-        # Insert the new row
-        return self._insert_row(cursor, new_row_data)
+        self._insert_rows(cursor, new_rows)
     
-    def _update_single_row(self, cursor, entry_id: int, entry_data: Dict) -> Optional[Dict]:
+    def _update_single_row(self, cursor, entry_id: int, entry_data: Dict, now: str) -> Optional[Dict]:
         """Update a single row (non-main entry)"""
         update_fields = []
         update_values = []
@@ -855,7 +1071,7 @@ class IndependentRowSQLiteAdapter:
                 update_fields.append(f"{field} = ?")
                 update_values.append(value)
         
-        update_values.append(datetime.utcnow().isoformat())
+        update_values.append(now)
         update_fields.append("updated_at = ?")
         update_values.append(entry_id)
         
@@ -863,9 +1079,8 @@ class IndependentRowSQLiteAdapter:
         cursor.execute(query, update_values)
         
         # Return updated entry
-        cursor.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        columns = [description[0] for description in cursor.description]
-        updated_row = dict(zip(columns, cursor.fetchone()))
+        cursor.execute(f"{SELECT_ENTRIES_SQL} WHERE id = ?", (entry_id,))
+        updated_row = dict(zip(READ_COLUMNS, cursor.fetchone()))
         
         cursor.connection.commit()
         return updated_row
@@ -875,56 +1090,46 @@ class IndependentRowSQLiteAdapter:
         Delete an entry and all related rows that belong to the same logical entry
         This ensures complete deletion of the entire entry group (main, PRB, HIIM, issue rows)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            # First, get the grouping_key of the entry to be deleted
-            cursor.execute("SELECT grouping_key FROM entries WHERE id = ?", (entry_id,))
-            result = cursor.fetchone()
-            
-            if not result:
-                logger.debug(f"Entry {entry_id} not found for deletion")
-                return False  # Entry not found
-            
-            grouping_key = result[0]
-            logger.debug(f"Deleting all entries with grouping_key: {grouping_key}")
-            
-            # Delete all rows with the same grouping_key (entire logical entry)
-            cursor.execute("DELETE FROM entries WHERE grouping_key = ?", (grouping_key,))
-            deleted_count = cursor.rowcount
-            deleted = deleted_count > 0
-            
-            logger.debug(f"Deleted {deleted_count} rows for grouping_key: {grouping_key}")
-            
-            conn.commit()
-            
-            # Force WAL checkpoint and ensure all changes are written to the main database
-            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
-            cursor.execute("PRAGMA synchronous=FULL") 
-            
-            # Additional verification: check that the entries are actually gone
-            cursor.execute("SELECT COUNT(*) FROM entries WHERE grouping_key = ?", (grouping_key,))
-            remaining_count = cursor.fetchone()[0]
-            if remaining_count > 0:
-                logger.warning(f"Warning: {remaining_count} entries still exist with grouping_key {grouping_key} after deletion")
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
             
-            return deleted
-        except Exception as e:
-            logger.error(f"Error deleting entry {entry_id}: {e}")
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+            try:
+                # First, get the grouping_key of the entry to be deleted
+                cursor.execute("SELECT grouping_key FROM entries WHERE id = ?", (entry_id,))
+                result = cursor.fetchone()
+                
+                if not result:
+                    logger.debug("Entry %s not found for deletion", entry_id)
+                    return False  # Entry not found
+                
+                grouping_key = result[0]
+                logger.debug("Deleting all entries with grouping_key: %s", grouping_key)
+                
+                # Delete all rows with the same grouping_key (entire logical entry)
+                cursor.execute("DELETE FROM entries WHERE grouping_key = ?", (grouping_key,))
+                deleted_count = cursor.rowcount
+                deleted = deleted_count > 0
+                
+                logger.debug("Deleted %s rows for grouping_key: %s", deleted_count, grouping_key)
+                
+                conn.commit()
+                
+                # The single DELETE removed the whole group atomically and every later read sees
+                # the commit, so there is nothing to verify and no need to force a checkpoint;
+                # SQLite's automatic checkpointing folds the WAL back in. Lookups that miss
+                # (EntryManager probes every database when no application is given) change no
+                # rows, so _write_connection leaves the cached reads alone.
+                return deleted
+            except Exception as e:
+                logger.error("Error deleting entry %s: %s", entry_id, e)
+                conn.rollback()
+                raise e
     
     def get_all_entries(self) -> List[Dict]:
         """Get all independent entries grouped for UI display"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM entries ORDER BY date DESC, grouping_key, row_position")
-        columns = [description[0] for description in cursor.description]
-        all_rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        with self._connection() as conn:
+            cursor = conn.execute(f"{SELECT_ENTRIES_SQL} ORDER BY date DESC, grouping_key, row_position")
+            all_rows = [dict(zip(READ_COLUMNS, row)) for row in cursor]
         
         # Group by grouping_key
         grouped_entries = {}
@@ -957,156 +1162,163 @@ class IndependentRowSQLiteAdapter:
                 main_entry['issues'] = group['issues']
                 result_entries.append(main_entry)
         
-        conn.close()
         return result_entries
     
     def get_entry_by_id(self, entry_id: int, application_name: str = None) -> Optional[Dict]:
         """Get a specific entry by ID from the independent row structure"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self._connection() as conn:
+                return self._fetch_entry(conn.cursor(), entry_id)
+        except Exception as e:
+            logger.error("Error in get_entry_by_id(%s): %s", entry_id, e, exc_info=True)
+            return None
+    
+    def _fetch_entry(self, cursor, entry_id: int) -> Optional[Dict]:
+        """Read an entry (with position-aligned PRB/HIIM/issue arrays for main rows) on the caller's cursor"""
+        # First, get the specific entry with the requested ID
+        cursor.execute(f"{SELECT_ENTRIES_SQL} WHERE id = ?", (entry_id,))
+        target_row = cursor.fetchone()
+        
+        if not target_row:
+            return None
+        
+        target_entry = dict(zip(READ_COLUMNS, target_row))
+        
+        # Ensure business_chain field exists for OTHERS entries
+        if target_entry.get('application_name', '').upper() == 'OTHERS' and 'business_chain' not in target_entry:
+            target_entry['business_chain'] = ''
+        # If this is a main entry, we need to find related PRBs, HIIMs, and issues
+        # that share the same grouping_key
+        if target_entry['row_type'] == 'main':
+            grouping_key = target_entry['grouping_key']
+            if not grouping_key:
+                # Generate grouping key if missing
+                grouping_key = f"{target_entry['date']}_{target_entry['application_name']}"
             
-            # First, get the specific entry with the requested ID
-            cursor.execute('SELECT * FROM entries WHERE id = ?', (entry_id,))
-            target_row = cursor.fetchone()
+            # Get all related rows with the same grouping key
+            cursor.execute(f'''
+                {SELECT_ENTRIES_SQL}
+                WHERE grouping_key = ? OR (date = ? AND application_name = ?)
+                ORDER BY row_position ASC, id ASC
+            ''', (grouping_key, target_entry['date'], target_entry['application_name']))
             
-            if not target_row:
-                conn.close()
-                return None
+            related_dicts = [dict(zip(READ_COLUMNS, row)) for row in cursor]
             
-            # Get column names
-            columns = [description[0] for description in cursor.description]
-            target_entry = dict(zip(columns, target_row))
+            # Build position-based arrays with null placeholders for Item Set alignment
+            prb_dict = {}
+            hiim_dict = {}
+            issue_dict = {}
+            max_position = 0
             
-            # Ensure business_chain field exists for OTHERS entries
-            if target_entry.get('application_name', '').upper() == 'OTHERS' and 'business_chain' not in target_entry:
-                target_entry['business_chain'] = ''
-            # If this is a main entry, we need to find related PRBs, HIIMs, and issues
-            # that share the same grouping_key
-            if target_entry['row_type'] == 'main':
-                grouping_key = target_entry['grouping_key']
-                if not grouping_key:
-                    # Generate grouping key if missing
-                    grouping_key = f"{target_entry['date']}_{target_entry['application_name']}"
-                
-                # Get all related rows with the same grouping key
-                cursor.execute('''
-                    SELECT * FROM entries 
-                    WHERE grouping_key = ? OR (date = ? AND application_name = ?)
-                    ORDER BY row_position ASC, id ASC
-                ''', (grouping_key, target_entry['date'], target_entry['application_name']))
-                
-                related_rows = cursor.fetchall()
-                related_dicts = [dict(zip(columns, row)) for row in related_rows]
-                
-                # Build position-based arrays with null placeholders for Item Set alignment
-                prb_dict = {}
-                hiim_dict = {}
-                issue_dict = {}
-                max_position = 0
-                
-                for row in related_dicts:
-                    if row['id'] == entry_id:
-                        # This is our main entry, keep it as target_entry
-                        continue
-                    
-                    position = row.get('row_position', 0)
-                    max_position = max(max_position, position)
-                    
-                    if row['row_type'] == 'prb':
-                        prb_dict[position] = {
-                            'id': row['id'],
-                            'prb_id_number': row['prb_id_number'],
-                            'prb_id_status': row['prb_id_status'],
-                            'prb_link': row['prb_link'],
-                            'row_position': position,  # Include position for frontend
-                            'created_at': row['created_at']
-                        }
-                    elif row['row_type'] == 'hiim':
-                        hiim_dict[position] = {
-                            'id': row['id'],
-                            'hiim_id_number': row['hiim_id_number'],
-                            'hiim_id_status': row['hiim_id_status'],
-                            'hiim_link': row['hiim_link'],
-                            'row_position': position,  # Include position for frontend
-                            'created_at': row['created_at']
-                        }
-                    elif row['row_type'] == 'issue':
-                        issue_dict[position] = {
-                            'id': row['id'],
-                            'description': row['issue_description'],
-                            'time_loss': row.get('time_loss', ''),
-                            'row_position': position,  # Include position for frontend
-                            'created_at': row['created_at']
-                        }
-                
-                # Build arrays with null placeholders to maintain Item Set positions
-                prbs = []
-                hiims = []
-                issues = []
+            for row in related_dicts:
+                if row['id'] == entry_id:
+                    # This is our main entry, keep it as target_entry
+                    continue
                 
-                for i in range(max_position + 1):
-                    prbs.append(prb_dict.get(i, None))
-                    hiims.append(hiim_dict.get(i, None))
-                    issues.append(issue_dict.get(i, None))
+                position = row.get('row_position', 0)
+                max_position = max(max_position, position)
                 
-                # Attach position-aligned arrays to main entry
-                target_entry['prbs'] = prbs
-                target_entry['hiims'] = hiims
-                target_entry['issues'] = issues
-            else:
-                # For non-main entries, just return the entry with empty arrays
-                target_entry['prbs'] = []
-                target_entry['hiims'] = []
-                target_entry['issues'] = []
+                if row['row_type'] == 'prb':
+                    prb_dict[position] = {
+                        'id': row['id'],
+                        'prb_id_number': row['prb_id_number'],
+                        'prb_id_status': row['prb_id_status'],
+                        'prb_link': row['prb_link'],
+                        'row_position': position,  # Include position for frontend
+                        'created_at': row['created_at']
+                    }
+                elif row['row_type'] == 'hiim':
+                    hiim_dict[position] = {
+                        'id': row['id'],
+                        'hiim_id_number': row['hiim_id_number'],
+                        'hiim_id_status': row['hiim_id_status'],
+                        'hiim_link': row['hiim_link'],
+                        'row_position': position,  # Include position for frontend
+                        'created_at': row['created_at']
+                    }
+                elif row['row_type'] == 'issue':
+                    issue_dict[position] = {
+                        'id': row['id'],
+                        'description': row['issue_description'],
+                        'time_loss': row.get('time_loss', ''),
+                        'row_position': position,  # Include position for frontend
+                        'created_at': row['created_at']
+                    }
             
-            conn.close()
-            return target_entry
+            # Build arrays with null placeholders to maintain Item Set positions
+            prbs = []
+            hiims = []
+            issues = []
             
-        except Exception as e:
-            logger.error("Error in get_entry_by_id(%s): %s", entry_id, e, exc_info=True)
-            return None
+            for i in range(max_position + 1):
+                prbs.append(prb_dict.get(i, None))
+                hiims.append(hiim_dict.get(i, None))
+                issues.append(issue_dict.get(i, None))
+            
+            # Attach position-aligned arrays to main entry
+            target_entry['prbs'] = prbs
+            target_entry['hiims'] = hiims
+            target_entry['issues'] = issues
+        else:
+            # For non-main entries, just return the entry with empty arrays
+            target_entry['prbs'] = []
+            target_entry['hiims'] = []
+            target_entry['issues'] = []
+        
+        return target_entry
     
     def get_setting(self, key: str) -> Optional[str]:
         """Get a setting value from the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        result = cursor.fetchone()
+        with self._connection() as conn:
+            result = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
         
-        conn.close()
         return result[0] if result else None
     
     def set_setting(self, key: str, value: str) -> bool:
         """Set a setting value in the database"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                (key, value)
-            )
-            
-            conn.commit()
-            conn.close()
+            with self._write_connection() as conn:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                        (key, value)
+                    )
             return True
         except Exception:
             return False
 
 
+# Process-wide adapters keyed by database path: one connection pool and one entries cache
+# per file however many EntryManagers are created, so a write through one is seen by all
+_adapters = {}
+_adapters_lock = threading.Lock()
+
+
+def get_adapter(db_name: str) -> IndependentRowSQLiteAdapter:
+    """Return the shared adapter for a database file, creating it on first use"""
+    db_path = os.path.abspath(f"./data/{db_name}")
+    with _adapters_lock:
+        adapter = _adapters.get(db_path)
+        if adapter is None:
+            adapter = _adapters[db_path] = IndependentRowSQLiteAdapter(db_name)
+        return adapter
+
+
 class EntryManager:
     """Entry manager for independent rows across multiple databases"""
     
     def __init__(self):
         self.adapters = {
-            'CVAR ALL': IndependentRowSQLiteAdapter('cvar_all.db'),
-            'CVAR NYQ': IndependentRowSQLiteAdapter('cvar_nyq.db'),
-            'XVA': IndependentRowSQLiteAdapter('xva.db'),
-            'REG': IndependentRowSQLiteAdapter('reg.db'),
-            'OTHERS': IndependentRowSQLiteAdapter('others.db')
+            'CVAR ALL': get_adapter('cvar_all.db'),
+            'CVAR NYQ': get_adapter('cvar_nyq.db'),
+            'XVA': get_adapter('xva.db'),
+            'REG': get_adapter('reg.db'),
+            'OTHERS': get_adapter('others.db')
         }
+        # Each application has its own database file and connection, so
+        # cross-application reads can run side by side (sqlite3 releases the GIL)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.adapters),
+                                            thread_name_prefix="prodvision-db")
     
     def get_entries_by_application(self, application_name: str, start_date: str = None, end_date: str = None) -> List[Dict]:
         """Get entries for specific application"""
@@ -1123,11 +1335,20 @@ class EntryManager:
             return []
         return adapter.get_individual_rows_by_application(application_name, start_date, end_date, row_type_filter)
 
+    def has_entry_on_date(self, application_name: str, date: str, exclude_id: int = None) -> bool:
+        """Check whether an entry (other than exclude_id) already exists for the application on this date"""
+        adapter = self.adapters.get(application_name.upper())
+        if not adapter:
+            return False
+        return adapter.has_entry_on_date(application_name, date, exclude_id)
+
     def get_all_individual_rows(self, row_type_filter: str = None) -> List[Dict]:
         """Get all individual rows from all databases without grouping"""
+        results = self._executor.map(
+            lambda item: item[1].get_individual_rows_by_application(item[0], None, None, row_type_filter),
+            self.adapters.items())
         all_rows = []
-        for app_name, adapter in self.adapters.items():
-            rows = adapter.get_individual_rows_by_application(app_name, None, None, row_type_filter)
+        for rows in results:
             all_rows.extend(rows)
         return all_rows
     
@@ -1193,8 +1414,7 @@ class EntryManager:
     def get_all_entries(self) -> List[Dict]:
         """Get all entries from all databases"""
         all_entries = []
-        for app_name, adapter in self.adapters.items():
-            entries = adapter.get_all_entries()
+        for entries in self._executor.map(lambda adapter: adapter.get_all_entries(), self.adapters.values()):
             all_entries.extend(entries)
         return all_entries
     
@@ -3,14 +3,13 @@ import threading
 import time
 import random
 import logging
+from collections import Counter
 
 from flask import Flask, render_template, request, jsonify, session, send_file
 from flask_session import Session
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import bcrypt
 from flask_cors import CORS
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
 import io
 # Import new independent row adapter
 from independent_row_adapter import EntryManager as ProductionEntryManager
@@ -38,6 +37,13 @@ logger = logging.getLogger("prodvision")
 if not DEBUG and not LOG_LEVEL_NAME:
     logging.getLogger('werkzeug').setLevel(logging.ERROR)
 
+# Allowed values used by validation and filtering (tuples so unhashable JSON values still compare safely)
+RAG_STATUSES = ('Red', 'Yellow', 'Green')
+ID_STATUSES = ('active', 'closed')
+REG_STATUSES = ('ongoing', 'open', 'closed', 'Open', 'In Progress', 'Resolved', 'Closed')
+ROW_TYPES = ('main', 'prb', 'hiim', 'issue')
+EMPTY_TIME_LOSS_VALUES = ('', 'N/A', 'NA', 'NONE', 'NULL')
+
 app = Flask(__name__)
 
 # Enable CORS for credentials
@@ -215,23 +221,22 @@ def validate_entry_data(data):
     # Validate status values based on application type
     if application_name == 'XVA':
         # XVA-specific validation
-        if data.get('valo_status') and data['valo_status'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('valo_status') and data['valo_status'] not in RAG_STATUSES:
             return False, 'Invalid VALO status'
-        if data.get('sensi_status') and data['sensi_status'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('sensi_status') and data['sensi_status'] not in RAG_STATUSES:
             return False, 'Invalid SENSI status'
-        if data.get('cf_ra_status') and data['cf_ra_status'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('cf_ra_status') and data['cf_ra_status'] not in RAG_STATUSES:
             return False, 'Invalid CF RA status'
-        if data.get('quality_legacy') and data['quality_legacy'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('quality_legacy') and data['quality_legacy'] not in RAG_STATUSES:
             return False, 'Invalid quality legacy status'
-        if data.get('quality_target') and data['quality_target'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('quality_target') and data['quality_target'] not in RAG_STATUSES:
             return False, 'Invalid quality target status'
         # Skip CVAR-specific validation for XVA entries
     elif application_name == 'REG':
         # REG-specific validation (accept legacy and new values)
         reg_status_val = data.get('reg_status')
         if reg_status_val:
-            valid_reg_statuses = {'ongoing', 'open', 'closed', 'Open', 'In Progress', 'Resolved', 'Closed'}
-            if reg_status_val not in valid_reg_statuses:
+            if reg_status_val not in REG_STATUSES:
                 return False, 'Invalid REG status'
         # Skip CVAR/XVA-specific validation for REG entries
     elif application_name == 'OTHERS':
@@ -240,11 +245,11 @@ def validate_entry_data(data):
         pass
     else:
         # CVAR-specific validation - validate single fields or arrays
-        if data.get('prc_mail_status') and data['prc_mail_status'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('prc_mail_status') and data['prc_mail_status'] not in RAG_STATUSES:
             return False, 'Invalid PRC mail status'
-        if data.get('cp_alerts_status') and data['cp_alerts_status'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('cp_alerts_status') and data['cp_alerts_status'] not in RAG_STATUSES:
             return False, 'Invalid CP alerts status'
-        if data.get('quality_status') and data['quality_status'] not in ['Red', 'Yellow', 'Green']:
+        if data.get('quality_status') and data['quality_status'] not in RAG_STATUSES:
             return False, 'Invalid quality status'
 
         # Validate PRBs array if present
@@ -255,7 +260,7 @@ def validate_entry_data(data):
                         int(prb['prb_id_number'])
                     except Exception:
                         return False, 'Invalid PRB id number'
-                if prb is not None and prb.get('prb_id_status') and prb['prb_id_status'] not in ['active', 'closed']:
+                if prb is not None and prb.get('prb_id_status') and prb['prb_id_status'] not in ID_STATUSES:
                     return False, 'Invalid PRB ID status in array'
 
         # Validate HIIMs array if present
@@ -266,13 +271,13 @@ def validate_entry_data(data):
                         int(hiim['hiim_id_number'])
                     except Exception:
                         return False, 'Invalid HIIM id number'
-                if hiim is not None and hiim.get('hiim_id_status') and hiim['hiim_id_status'] not in ['active', 'closed']:
+                if hiim is not None and hiim.get('hiim_id_status') and hiim['hiim_id_status'] not in ID_STATUSES:
                     return False, 'Invalid HIIM ID status in array'
     
     # Common validation for all applications
-    if data.get('prb_id_status') and data['prb_id_status'] not in ['active', 'closed']:
+    if data.get('prb_id_status') and data['prb_id_status'] not in ID_STATUSES:
         return False, 'Invalid PRB ID status'
-    if data.get('hiim_id_status') and data['hiim_id_status'] not in ['active', 'closed']:
+    if data.get('hiim_id_status') and data['hiim_id_status'] not in ID_STATUSES:
         return False, 'Invalid HIIM ID status'
     
     return True, None
@@ -280,7 +285,12 @@ def validate_entry_data(data):
 def convert_date_string(date_str):
     """Convert date string to datetime object"""
     if isinstance(date_str, str):
-        return datetime.strptime(date_str, '%Y-%m-%d').date()
+        try:
+            # Fast path for the zero-padded YYYY-MM-DD the UI always sends
+            return date.fromisoformat(date_str)
+        except ValueError:
+            # strptime also accepts non-padded values such as 2025-8-1
+            return datetime.strptime(date_str, '%Y-%m-%d').date()
     return date_str
 
 def validate_independent_row_constraints(data):
@@ -320,7 +330,7 @@ def validate_independent_row_constraints(data):
                 return False, 'All Issues must have the same date as the main entry for independent row integrity'
     
     # Validate that row_type if provided is valid
-    if data.get('row_type') and data['row_type'] not in ['main', 'prb', 'hiim', 'issue']:
+    if data.get('row_type') and data['row_type'] not in ROW_TYPES:
         return False, 'Invalid row_type. Must be one of: main, prb, hiim, issue'
     
     return True, None
@@ -467,30 +477,31 @@ def get_entries():
             return any(h and (h.get('hiim_id_number') or h.get('hiim_id')) for h in hiims)
 
         def has_time_loss(ent):
-            # Check top-level time_loss field for meaningful values
-            top_level_time_loss = ent.get('time_loss', '').strip()
-            if top_level_time_loss and top_level_time_loss.upper() not in ['N/A', 'NA', 'NONE', 'NULL']:
+            # Check top-level time_loss field for meaningful values (blank counts as empty)
+            if ent.get('time_loss', '').strip().upper() not in EMPTY_TIME_LOSS_VALUES:
                 return True
             
-            # Check issues array for meaningful time_loss values
+            # Check issues array for meaningful time_loss values; any() stops at the first hit
             issues = ent.get('issues') or []
-            return any(i and i.get('time_loss', '').strip() and 
-                      i.get('time_loss', '').strip().upper() not in ['N/A', 'NA', 'NONE', 'NULL'] 
-                      for i in issues)
+            return any(i and i.get('time_loss', '').strip().upper() not in EMPTY_TIME_LOSS_VALUES
+                       for i in issues)
+
+        # Only apply date filters if we got all entries and not using row-level filtering
+        filter_by_date = not application and not use_row_level_filtering
+        # Parse the date bounds once rather than per entry
+        start_bound = convert_date_string(start_date) if filter_by_date and start_date else None
+        end_bound = convert_date_string(end_date) if filter_by_date and end_date else None
 
         # Apply remaining filters (non-date, non-application filters)
         filtered_entries = []
         for entry in all_entries:
             # Date filters (only needed if not already filtered at database level)
-            if not application and not use_row_level_filtering:  # Only apply date filters if we got all entries and not using row-level filtering
-                if start_date:
-                    entry_date = convert_date_string(entry.get('date', ''))
-                    if entry_date < datetime.strptime(start_date, '%Y-%m-%d').date():
-                        continue
-                if end_date:
-                    entry_date = convert_date_string(entry.get('date', ''))
-                    if entry_date > datetime.strptime(end_date, '%Y-%m-%d').date():
-                        continue
+            if start_bound or end_bound:
+                entry_date = convert_date_string(entry.get('date', ''))
+                if start_bound and entry_date < start_bound:
+                    continue
+                if end_bound and entry_date > end_bound:
+                    continue
             
             # Application filter (only needed if we got all entries)
             if not application and 'application' in request.args:
@@ -548,20 +559,20 @@ def get_entry(entry_id):
     """Get a specific production entry by ID"""
     try:
         application = request.args.get('application', '').upper()
-        logger.info(f"API GET /api/entries/{entry_id} called with application={application}")
+        logger.info("API GET /api/entries/%s called with application=%s", entry_id, application)
         entry = entry_manager.get_entry_by_id(entry_id, application if application else None)
         if entry:
-            logger.info(f"Entry found: id={entry_id}, application={application}")
+            logger.info("Entry found: id=%s, application=%s", entry_id, application)
             response = jsonify(entry)
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
             response.headers['Pragma'] = 'no-cache'
             response.headers['Expires'] = '0'
             return response
         else:
-            logger.warning(f"Entry NOT found: id={entry_id}, application={application}")
+            logger.warning("Entry NOT found: id=%s, application=%s", entry_id, application)
             return jsonify({'error': 'Entry not found'}), 404
     except Exception as e:
-        logger.error(f"Error fetching entry {entry_id} for application {application}: {e}", exc_info=True)
+        logger.error("Error fetching entry %s for application %s: %s", entry_id, application, e, exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/entries', methods=['POST'])
@@ -584,10 +595,8 @@ def create_entry():
         # Serialize duplicate date/application check & create to avoid race
         with _create_entry_lock:
             application_name = data['application_name']
-            existing_entries = entry_manager.get_entries_by_application(application_name)
-            for existing_entry in existing_entries:
-                if existing_entry.get('date') == data['date']:
-                    return jsonify({'error': f'An entry already exists for {application_name} on {data["date"]}'}), 400
+            if entry_manager.has_entry_on_date(application_name, data['date']):
+                return jsonify({'error': f'An entry already exists for {application_name} on {data["date"]}'}), 400
             # Create new entry
             entry = entry_manager.create_entry(data)
         
@@ -604,12 +613,12 @@ def update_entry(entry_id):
     """Update an existing production entry"""
     try:
         data = request.get_json()
-        logger.info(f"API update_entry called for id={entry_id}, data={data}")
+        logger.info("API update_entry called for id=%s, data=%s", entry_id, data)
 
         # Get existing entry - search all databases
         existing_entry = entry_manager.get_entry_by_id(entry_id)
         if not existing_entry:
-            logger.warning(f"Entry not found for id={entry_id}")
+            logger.warning("Entry not found for id=%s", entry_id)
             return jsonify({'error': 'Entry not found'}), 404
 
         existing_application = existing_entry.get('application_name')
@@ -620,23 +629,21 @@ def update_entry(entry_id):
             new_application = data.get('application_name', existing_application)
 
             # Check if another entry exists for this date and application (excluding current entry)
-            app_entries = entry_manager.get_entries_by_application(new_application)
-            for entry in app_entries:
-                if (entry.get('id') != entry_id and entry.get('date') == new_date):
-                    logger.warning(f"Duplicate entry found for application={new_application} on date={new_date}")
-                    return jsonify({'error': f'An entry already exists for {new_application} on {new_date}'}), 400
+            if entry_manager.has_entry_on_date(new_application, new_date, exclude_id=entry_id):
+                logger.warning("Duplicate entry found for application=%s on date=%s", new_application, new_date)
+                return jsonify({'error': f'An entry already exists for {new_application} on {new_date}'}), 400
 
         # Validate entry data using the updated validation function
         merged_data = dict(existing_entry)
         merged_data.update(data)
         is_valid, error_message = validate_entry_data(merged_data)
         if not is_valid:
-            logger.warning(f"Validation failed for id={entry_id}: {error_message}")
+            logger.warning("Validation failed for id=%s: %s", entry_id, error_message)
             return jsonify({'error': error_message}), 400
 
         # Update entry - pass the application name for database targeting
         updated_entry = entry_manager.update_entry(entry_id, data, existing_application)
-        logger.info(f"Update result for id={entry_id}: {updated_entry}")
+        logger.info("Update result for id=%s: %s", entry_id, updated_entry)
 
         # For XVA, return fresh entries list for immediate UI update
         if existing_application == 'XVA':
@@ -650,10 +657,10 @@ def update_entry(entry_id):
         if updated_entry:
             return jsonify(updated_entry)
         else:
-            logger.error(f"Failed to update entry for id={entry_id}")
+            logger.error("Failed to update entry for id=%s", entry_id)
             return jsonify({'error': 'Failed to update entry'}), 500
     except Exception as e:
-        logger.error(f'Exception in API update_entry id={entry_id}: {e}', exc_info=True)
+        logger.error("Exception in API update_entry id=%s: %s", entry_id, e, exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/entries/<int:entry_id>', methods=['DELETE'])
@@ -683,6 +690,42 @@ def delete_entry(entry_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _combined_field(text_field, status_field):
+    """Excel column that shows a text field followed by its status, e.g. '09:15 Green'"""
+    return lambda e: f"{e.get(text_field, '')} {e.get(status_field, '')}".strip()
+
+_CVAR_EXCEL_LAYOUT = (
+    ('Date', 'Day', 'PRC Mail', 'CP Alerts', 'Quality', 'Punctuality Issue Description', 'Time Loss', 'PRB ID', 'HIIM ID', 'Remarks'),
+    ('date', 'day',
+     _combined_field('prc_mail_text', 'prc_mail_status'),
+     _combined_field('cp_alerts_text', 'cp_alerts_status'),
+     'quality_status', 'issue_description', 'time_loss', 'prb_id_number', 'hiim_id_number', 'remarks'),
+)
+
+# (headers, field mappings) per application; a mapping is a field name or a callable
+# taking the entry. Unknown applications use the CVAR layout.
+EXCEL_LAYOUTS = {
+    'CVAR ALL': _CVAR_EXCEL_LAYOUT,
+    'CVAR NYQ': _CVAR_EXCEL_LAYOUT,
+    'XVA': (
+        ('Date', 'Day', 'Acq', 'Valo', 'Sensi', 'CF RA', 'Quality Legacy', 'Quality Target', 'Root Cause Application', 'Root Cause Type', 'XVA Remarks', 'PRB ID', 'HIIM ID', 'Time Loss'),
+        ('date', 'day',
+         _combined_field('acq_text', 'acq_status'),
+         _combined_field('valo_text', 'valo_status'),
+         _combined_field('sensi_text', 'sensi_status'),
+         _combined_field('cf_ra_text', 'cf_ra_status'),
+         'quality_legacy', 'quality_target', 'root_cause_application', 'root_cause_type', 'xva_remarks', 'prb_id_number', 'hiim_id_number', 'time_loss'),
+    ),
+    'REG': (
+        ('Date', 'Day', 'Closing', 'Iteration', 'Issue', 'Action Taken and Update', 'Status', 'PRB', 'HIIM', 'Backlog Item'),
+        ('date', 'day', 'closing', 'iteration', 'reg_issue', 'action_taken_and_update', 'reg_status', 'reg_prb', 'reg_hiim', 'backlog_item'),
+    ),
+    'OTHERS': (
+        ('Date', 'Day', 'BUSINESS CHAIN', 'TIMINGS', 'PUNTUALITY ISSUE', 'QUALITY', 'QUALITY ISSUE', 'PRB', 'HIIM'),
+        ('date', 'day', 'business_chain', 'timings', 'puntuality_issue', 'quality', 'quality_issue', 'others_prb', 'others_hiim'),
+    ),
+}
+
 @app.route('/api/download/excel')
 @require_auth
 def download_excel():
@@ -702,49 +745,19 @@ def download_excel():
         if not entries:
             return jsonify({'error': f'No data available for {application}'}), 404
         
+        # openpyxl is only needed for this export, so it is imported on first use
+        import openpyxl
+        from openpyxl.styles import Font, Alignment, PatternFill
+        
         # Create a new workbook and worksheet
         wb = openpyxl.Workbook()
         ws = wb.active
         ws.title = f"{application} Dashboard Data"
         
-        # Define column structure based on application (matching exactly what dashboard shows)
-        if application in ['CVAR ALL', 'CVAR NYQ']:
-            headers = ['Date', 'Day', 'PRC Mail', 'CP Alerts', 'Quality', 'Punctuality Issue Description', 'Time Loss', 'PRB ID', 'HIIM ID', 'Remarks']
-            field_mappings = [
-                'date', 'day', 
-                lambda e: f"{e.get('prc_mail_text', '')} {e.get('prc_mail_status', '')}".strip(),
-                lambda e: f"{e.get('cp_alerts_text', '')} {e.get('cp_alerts_status', '')}".strip(),
-                'quality_status', 'issue_description', 'time_loss', 'prb_id_number', 'hiim_id_number', 'remarks'
-            ]
-        elif application == 'XVA':
-            headers = ['Date', 'Day', 'Acq', 'Valo', 'Sensi', 'CF RA', 'Quality Legacy', 'Quality Target', 'Root Cause Application', 'Root Cause Type', 'XVA Remarks', 'PRB ID', 'HIIM ID', 'Time Loss']
-            field_mappings = [
-                'date', 'day', 
-                lambda e: f"{e.get('acq_text', '')} {e.get('acq_status', '')}".strip(),
-                lambda e: f"{e.get('valo_text', '')} {e.get('valo_status', '')}".strip(),
-                lambda e: f"{e.get('sensi_text', '')} {e.get('sensi_status', '')}".strip(),
-                lambda e: f"{e.get('cf_ra_text', '')} {e.get('cf_ra_status', '')}".strip(),
-                'quality_legacy', 'quality_target', 'root_cause_application', 'root_cause_type', 'xva_remarks', 'prb_id_number', 'hiim_id_number', 'time_loss'
-            ]
-        elif application == 'REG':
-            headers = ['Date', 'Day', 'Closing', 'Iteration', 'Issue', 'Action Taken and Update', 'Status', 'PRB', 'HIIM', 'Backlog Item']
-            field_mappings = [
-                'date', 'day', 'closing', 'iteration', 'reg_issue', 'action_taken_and_update', 'reg_status', 'reg_prb', 'reg_hiim', 'backlog_item'
-            ]
-        elif application == 'OTHERS':
-            headers = ['Date', 'Day', 'BUSINESS CHAIN', 'TIMINGS', 'PUNTUALITY ISSUE', 'QUALITY', 'QUALITY ISSUE', 'PRB', 'HIIM']
-            field_mappings = [
-                'date', 'day', 'business_chain', 'timings', 'puntuality_issue', 'quality', 'quality_issue', 'others_prb', 'others_hiim'
-            ]
-        else:
-            # Default for unknown applications
-            headers = ['Date', 'Day', 'PRC Mail', 'CP Alerts', 'Quality', 'Punctuality Issue Description', 'Time Loss', 'PRB ID', 'HIIM ID', 'Remarks']
-            field_mappings = [
-                'date', 'day', 
-                lambda e: f"{e.get('prc_mail_text', '')} {e.get('prc_mail_status', '')}".strip(),
-                lambda e: f"{e.get('cp_alerts_text', '')} {e.get('cp_alerts_status', '')}".strip(),
-                'quality_status', 'issue_description', 'time_loss', 'prb_id_number', 'hiim_id_number', 'remarks'
-            ]        # Write headers
+        # Column structure for this application (matching exactly what the dashboard shows)
+        headers, field_mappings = EXCEL_LAYOUTS.get(application, EXCEL_LAYOUTS['CVAR ALL'])
+        
+        # Write headers
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=1, column=col, value=header)
             cell.font = Font(bold=True, color="FFFFFF")
@@ -818,19 +831,19 @@ def get_stats():
         else:
             all_entries = entry_manager.get_all_entries()
         
+        # Date range filters only apply when getting all entries, not when application-specific
+        start_bound = convert_date_string(start_date) if not application and start_date else None
+        end_bound = convert_date_string(end_date) if not application and end_date else None
+
         # Apply additional filters (date filters already applied when application is specified)
         entries = []
         for entry in all_entries:
-            # Date range filters (only apply when getting all entries, not when application-specific)
-            if not application:
-                if start_date:
-                    entry_date = convert_date_string(entry.get('date', ''))
-                    if entry_date < datetime.strptime(start_date, '%Y-%m-%d').date():
-                        continue
-                if end_date:
-                    entry_date = convert_date_string(entry.get('date', ''))
-                    if entry_date > datetime.strptime(end_date, '%Y-%m-%d').date():
-                        continue
+            if start_bound or end_bound:
+                entry_date = convert_date_string(entry.get('date', ''))
+                if start_bound and entry_date < start_bound:
+                    continue
+                if end_bound and entry_date > end_bound:
+                    continue
             
             # Monthly and yearly filters
             if years or months:
@@ -861,7 +874,7 @@ def get_stats():
         punctuality_counts = {'Red': 0, 'Yellow': 0, 'Green': 0}
         prb_counts = {'active': 0, 'closed': 0}
         hiim_counts = {'active': 0, 'closed': 0}
-        app_counts = {}
+        app_counts = Counter(entry.get('application_name', 'Unknown') for entry in entries)
         
         # Monthly breakdown for comparison charts
         monthly_quality = {}
@@ -1019,9 +1032,6 @@ def get_stats():
                     if hiim and hiim.get('hiim_id_status') in hiim_counts:
                         hiim_counts[hiim['hiim_id_status']] += 1
                         monthly_hiim[month_key][hiim['hiim_id_status']] += 1
-            
-            application_name = entry.get('application_name', 'Unknown')
-            app_counts[application_name] = app_counts.get(application_name, 0) + 1
         
         # Convert monthly data to sorted list
         monthly_quality_list = sorted(monthly_quality.items(), key=lambda x: x[0])
@@ -1118,6 +1128,9 @@ def get_xva_stats():
         # Get all entries from SharePoint SQLite database and filter for XVA only
         all_entries = entry_manager.get_all_entries()
         
+        start_bound = convert_date_string(start_date) if start_date else None
+        end_bound = convert_date_string(end_date) if end_date else None
+
         # Apply filters for XVA entries only
         entries = []
         for entry in all_entries:
@@ -1126,13 +1139,11 @@ def get_xva_stats():
                 continue
             
             # Date range filters
-            if start_date:
+            if start_bound or end_bound:
                 entry_date = convert_date_string(entry.get('date', ''))
-                if entry_date < datetime.strptime(start_date, '%Y-%m-%d').date():
+                if start_bound and entry_date < start_bound:
                     continue
-            if end_date:
-                entry_date = convert_date_string(entry.get('date', ''))
-                if entry_date > datetime.strptime(end_date, '%Y-%m-%d').date():
+                if end_bound and entry_date > end_bound:
                     continue
             
             # Monthly and yearly filters